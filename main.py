@@ -1,7 +1,196 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 from matplotlib.gridspec import GridSpec
+import hashlib
+import inspect
+import os
+import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, wraps
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Run the kernels as plain Python when Numba is not installed
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+try:
+    import datashader as ds
+    import pandas as pd
+    DATASHADER_AVAILABLE = True
+except ImportError:
+    DATASHADER_AVAILABLE = False
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    def tqdm(iterable, **kwargs):
+        # No progress bar when tqdm is not installed
+        return iterable
+
+@njit('void(float32[:], float32, int64, int64, float32[:, :])',
+      parallel=True, fastmath=True, cache=True)
+def _bifurcation_kernel(a_values, x0, n_transient, n_keep, out_x):
+    """
+    Iterate the logistic map for every a value, writing the asymptotic
+    samples into out_x with shape (n_keep, len(a_values)).
+    
+    The update is written as a*x - a*x*x so that fastmath can contract it
+    into a single fused multiply-subtract. State is kept in float32, which
+    is ample for a pixel-quantized diagram and doubles the SIMD lane count.
+    """
+    for i in prange(a_values.size):
+        a = a_values[i]
+        x = x0
+        
+        for k in range(n_transient + n_keep):
+            a_x = a * x
+            x = a_x - a_x * x
+            
+            # Discard transients, then collect asymptotic values
+            if k >= n_transient:
+                out_x[k - n_transient, i] = x
+
+def _bifurcation_numpy(a_values, x0, n_transient, n_keep, out_x):
+    """
+    Vectorized fallback for _bifurcation_kernel when Numba is not installed.
+    """
+    # Iterate every a value at once, updating the state in place
+    x = np.full(a_values.size, x0, dtype=np.float32)
+    a_x = np.empty_like(x)
+    
+    for t in range(n_transient + n_keep):
+        np.multiply(x, a_values, out=a_x)
+        np.multiply(a_x, x, out=x)
+        np.subtract(a_x, x, out=x)
+        
+        # Discard transients, then collect asymptotic values
+        if t >= n_transient:
+            out_x[t - n_transient] = x
+
+# Map evaluations (n_a * n_iterations) below which the serial NumPy path
+# beats a process pool; spawn/forkserver pools take ~1 s just to start
+PARALLEL_MIN_EVALUATIONS = 2e9
+
+def _bifurcation_chunk(a_chunk, x0, n_transient, n_keep):
+    """
+    Worker for the multi-process fallback: run _bifurcation_numpy over one
+    chunk of a values and return its (n_keep, len(a_chunk)) samples.
+    """
+    out_x = np.empty((n_keep, a_chunk.size), dtype=np.float32)
+    _bifurcation_numpy(a_chunk, x0, n_transient, n_keep, out_x)
+    return out_x
+
+@njit(cache=True)
+def _cobweb_kernel(a, x0, n_iter, lo, hi, cobweb_x, cobweb_y):
+    """
+    Fill cobweb_x and cobweb_y (length 2 * n_iter + 2) with the cobweb path
+    starting at (x0, 0) and return the number of points written. Iteration
+    stops early once the trajectory leaves [lo, hi].
+    """
+    # Add starting point
+    cobweb_x[0] = x0
+    cobweb_y[0] = 0.0
+    cobweb_x[1] = x0
+    cobweb_y[1] = x0
+    
+    k = 2
+    x_n = x0
+    for _ in range(n_iter):
+        x_next = a * x_n * (1.0 - x_n)
+        
+        # Vertical line from (x_n, x_n) to (x_n, f(x_n))
+        cobweb_x[k] = x_n
+        cobweb_y[k] = x_next
+        
+        # Horizontal line from (x_n, f(x_n)) to (f(x_n), f(x_n))
+        cobweb_x[k + 1] = x_next
+        cobweb_y[k + 1] = x_next
+        
+        k += 2
+        x_n = x_next
+        
+        # Break if trajectory escapes the range
+        if x_n < lo or x_n > hi:
+            break
+    
+    return k
+
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'logistic_map')
+
+# Bump when the bifurcation kernels change so stale cache entries are ignored
+CACHE_VERSION = 1
+
+def npz_cache(func):
+    """
+    Cache the (a_values, x_values) result of a method in an .npz file,
+    keyed by the method name, its bound arguments and CACHE_VERSION.
+    Only one row of the broadcast a values is stored; failures to read or
+    write the cache fall back to computing the data, and unreadable cache
+    files are deleted. Files are written atomically via a temporary file.
+    """
+    signature = inspect.signature(func)
+    
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        params = tuple((name, value) for name, value in bound.arguments.items()
+                       if name != 'self')
+        key = hashlib.sha1(repr((func.__name__, CACHE_VERSION, 'float32',
+                                 params)).encode()).hexdigest()
+        path = os.path.join(CACHE_DIR, f"bif_{key[:16]}.npz")
+        
+        if os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    a_row, x_vals = data['a'], data['x']
+                n_rows = x_vals.size // a_row.size if a_row.size else 0
+                if n_rows * a_row.size != x_vals.size:
+                    raise ValueError("x values do not match the stored a values")
+            except Exception as exc:
+                # Any corrupt or truncated file is dropped and regenerated
+                print(f"Discarding unreadable cache file {path}: {exc}")
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            else:
+                print(f"Loading cached data from {path}")
+                return np.broadcast_to(a_row, (n_rows, a_row.size)).ravel(), x_vals
+        
+        a_vals, x_vals = func(self, *args, **kwargs)
+        tmp_path = None
+        try:
+            # Write to a temporary file and rename it so that an interrupted
+            # run never leaves a partial cache file behind
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.npz', dir=CACHE_DIR)
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, a=a_vals[:bound.arguments['n_a']], x=x_vals)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            print(f"Could not write cache file {path}: {exc}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+        return a_vals, x_vals
+    
+    return wrapper
 
 class LogisticMapVisualizer:
     """
@@ -14,7 +203,8 @@ class LogisticMapVisualizer:
         self.fig_size = (12, 8)
         self.dpi = 100
         
-    def logistic_map(self, x, a):
+    @staticmethod
+    def logistic_map(x, a):
         """
         Compute the logistic map function: x_{n+1} = a * x_n * (1 - x_n)
         
@@ -27,18 +217,37 @@ class LogisticMapVisualizer:
         """
         return a * x * (1 - x)
     
-    def plot_stability(self, a=2.5, x_range=(0, 1), n_points=1000):
+    def _screen_points(self, width_inches):
+        """
+        Number of points needed to draw a smooth curve across a width,
+        i.e. one point per pixel at the visualizer's resolution.
+        
+        Args:
+            width_inches (float): Width the curve spans, in inches
+            
+        Returns:
+            int: Number of points
+        """
+        return max(int(self.dpi * width_inches), 2)
+    
+    def plot_stability(self, a=2.5, x_range=(0, 1), n_points=None, ax=None):
         """
         Create a stability plot showing the logistic map function and identity line.
         
         Args:
             a (float): Growth parameter for the logistic map
             x_range (tuple): Range of x values to plot
-            n_points (int): Number of points for smooth curve
+            n_points (int): Number of points for smooth curve, defaults to
+                the width of the axes in pixels
+            ax (Axes): Axes to draw into; a new figure is shown if omitted
         """
-        fig, ax = plt.subplots(figsize=(8, 6), dpi=self.dpi)
+        standalone = ax is None
+        if standalone:
+            fig, ax = plt.subplots(figsize=(8, 6), dpi=self.dpi)
         
         # Generate x values for smooth curve
+        if n_points is None:
+            n_points = self._screen_points(ax.bbox.width / ax.figure.dpi)
         x = np.linspace(x_range[0], x_range[1], n_points)
         
         # Calculate logistic map function
@@ -68,10 +277,45 @@ class LogisticMapVisualizer:
         ax.set_xlim(x_range)
         ax.set_ylim(x_range)
         
-        plt.tight_layout()
-        plt.show()
+        if standalone:
+            plt.tight_layout()
+            plt.show()
     
-    def plot_cobweb(self, a=3.2, x0=0.1, n_iter=50, x_range=(0, 1)):
+    def _cobweb_path(self, a, x0, n_iter, x_range):
+        """
+        Compute the cobweb path for a trajectory.
+        
+        Args:
+            a (float): Growth parameter
+            x0 (float): Initial condition
+            n_iter (int): Maximum number of iterations
+            x_range (tuple): Trajectory stops once it leaves this range
+            
+        Returns:
+            tuple: (cobweb_x, cobweb_y) vertices of the path
+        """
+        cobweb_x = np.empty(2 * n_iter + 2)
+        cobweb_y = np.empty(2 * n_iter + 2)
+        k = _cobweb_kernel(float(a), float(x0), n_iter, float(x_range[0]),
+                           float(x_range[1]), cobweb_x, cobweb_y)
+        return cobweb_x[:k], cobweb_y[:k]
+    
+    def _draw_cobweb(self, ax, cobweb_x, cobweb_y, label=None):
+        """
+        Draw a cobweb path onto an axes as a single collection of segments.
+        
+        Args:
+            ax (Axes): Axes to draw into
+            cobweb_x (array): x coordinates of the path vertices
+            cobweb_y (array): y coordinates of the path vertices
+            label (str): Legend label for the path
+        """
+        points = np.column_stack((cobweb_x, cobweb_y))
+        segments = np.stack((points[:-1], points[1:]), axis=1)
+        ax.add_collection(LineCollection(segments, colors='g', linewidths=1,
+                                         alpha=0.7, label=label))
+    
+    def plot_cobweb(self, a=3.2, x0=0.1, n_iter=50, x_range=(0, 1), ax=None):
         """
         Create a cobweb diagram to visualize iteration dynamics.
         
@@ -80,49 +324,26 @@ class LogisticMapVisualizer:
             x0 (float): Initial condition
             n_iter (int): Number of iterations to plot
             x_range (tuple): Range for plotting
+            ax (Axes): Axes to draw into; a new figure is shown if omitted
         """
-        fig, ax = plt.subplots(figsize=(8, 8), dpi=self.dpi)
+        standalone = ax is None
+        if standalone:
+            fig, ax = plt.subplots(figsize=(8, 8), dpi=self.dpi)
         
         # Generate x values for function plotting
-        x = np.linspace(x_range[0], x_range[1], 1000)
+        x = np.linspace(x_range[0], x_range[1],
+                        self._screen_points(ax.bbox.width / ax.figure.dpi))
         y_logistic = self.logistic_map(x, a)
         
         # Plot the logistic map function and identity line
         ax.plot(x, y_logistic, 'b-', linewidth=2, label=f'f(x) = {a}x(1-x)')
         ax.plot(x, x, 'r--', linewidth=2, label='y = x')
         
-        # Initialize cobweb diagram
-        x_n = x0
-        cobweb_x = []
-        cobweb_y = []
-        
-        # Add starting point
-        cobweb_x.append(x_n)
-        cobweb_y.append(0)
-        cobweb_x.append(x_n)
-        cobweb_y.append(x_n)
-        
         # Generate cobweb iterations
-        for i in range(n_iter):
-            x_next = self.logistic_map(x_n, a)
-            
-            # Vertical line from (x_n, x_n) to (x_n, f(x_n))
-            cobweb_x.append(x_n)
-            cobweb_y.append(x_next)
-            
-            # Horizontal line from (x_n, f(x_n)) to (f(x_n), f(x_n))
-            cobweb_x.append(x_next)
-            cobweb_y.append(x_next)
-            
-            x_n = x_next
-            
-            # Break if trajectory escapes the range
-            if x_n < x_range[0] or x_n > x_range[1]:
-                break
+        cobweb_x, cobweb_y = self._cobweb_path(a, x0, n_iter, x_range)
         
         # Plot cobweb lines
-        ax.plot(cobweb_x, cobweb_y, 'g-', linewidth=1, alpha=0.7, 
-                label=f'Cobweb (x₀ = {x0})')
+        self._draw_cobweb(ax, cobweb_x, cobweb_y, label=f'Cobweb (x₀ = {x0})')
         
         # Mark initial condition
         ax.plot(x0, 0, 'go', markersize=8, label=f'Initial: x₀ = {x0}')
@@ -136,11 +357,14 @@ class LogisticMapVisualizer:
         ax.set_xlim(x_range)
         ax.set_ylim(x_range)
         
-        plt.tight_layout()
-        plt.show()
+        if standalone:
+            plt.tight_layout()
+            plt.show()
     
+    @npz_cache
     def generate_bifurcation_data(self, a_range=(0.5, 4.0), n_a=2000, 
-                                 x0=0.5, n_iterations=1000, n_transient=500):
+                                 x0=0.5, n_iterations=1000, n_transient=500,
+                                 n_samples=256):
         """
         Generate data for bifurcation diagram.
         
@@ -150,45 +374,85 @@ class LogisticMapVisualizer:
             x0 (float): Initial condition
             n_iterations (int): Total iterations per a value
             n_transient (int): Transient iterations to discard
+            n_samples (int): Asymptotic values to keep per a, taken from the
+                end of the trajectory
             
         Returns:
             tuple: (a_values, x_values) for plotting
         """
+        # Only the last n_samples values are stored; a fixed stride would
+        # alias with periodic orbits and hide branches of the diagram
+        n_keep = max(0, min(n_samples, n_iterations - n_transient))
+        n_transient = n_iterations - n_keep
+        
         print(f"Generating bifurcation data...")
         print(f"Parameter range: {a_range}")
         print(f"Number of a values: {n_a}")
         print(f"Iterations per a: {n_iterations} (discarding first {n_transient})")
+        print(f"Samples kept per a: {n_keep}")
         
         start_time = time.time()
         
-        a_values = np.linspace(a_range[0], a_range[1], n_a)
-        bifurcation_a = []
-        bifurcation_x = []
+        a_values = np.linspace(a_range[0], a_range[1], n_a, dtype=np.float32)
         
-        for i, a in enumerate(a_values):
-            if i % (n_a // 20) == 0:  # Progress indicator
-                progress = (i / n_a) * 100
-                print(f"Progress: {progress:.1f}%")
-            
-            x = x0
-            
-            # Iterate and discard transients
-            for _ in range(n_transient):
-                x = self.logistic_map(x, a)
-            
-            # Collect asymptotic values
-            for _ in range(n_iterations - n_transient):
-                x = self.logistic_map(x, a)
-                bifurcation_a.append(a)
-                bifurcation_x.append(x)
+        bifurcation_x = np.empty((n_keep, n_a), dtype=np.float32)
+        bifurcation_a = np.broadcast_to(a_values, bifurcation_x.shape)
+        
+        if NUMBA_AVAILABLE:
+            # Run the kernel over chunks of a values to report progress
+            n_chunks = max(1, min(20, n_a))
+            chunks = zip(np.array_split(a_values, n_chunks),
+                         np.array_split(bifurcation_x, n_chunks, axis=1))
+            for a_chunk, x_chunk in tqdm(chunks, total=n_chunks, desc="Progress"):
+                _bifurcation_kernel(a_chunk, x0, n_transient, n_keep, x_chunk)
+        elif n_a * n_iterations < PARALLEL_MIN_EVALUATIONS or (os.cpu_count() or 1) == 1:
+            _bifurcation_numpy(a_values, x0, n_transient, n_keep, bifurcation_x)
+        else:
+            # Sweep chunks of a values across worker processes
+            n_chunks = max(1, min(os.cpu_count() or 1, n_a))
+            worker = partial(_bifurcation_chunk, x0=x0, n_transient=n_transient,
+                             n_keep=n_keep)
+            with ProcessPoolExecutor(max_workers=n_chunks) as executor:
+                results = list(tqdm(
+                    executor.map(worker, np.array_split(a_values, n_chunks)),
+                    total=n_chunks, desc="Progress"))
+            np.concatenate(results, axis=1, out=bifurcation_x)
         
         elapsed_time = time.time() - start_time
         print(f"Data generation complete in {elapsed_time:.2f} seconds")
         
-        return np.array(bifurcation_a), np.array(bifurcation_x)
+        return bifurcation_a.ravel(), bifurcation_x.ravel()
+    
+    def _draw_bifurcation(self, ax, a_vals, x_vals, a_range):
+        """
+        Draw bifurcation data onto an axes as an image with one bin per
+        pixel; any pixel hit by a sample is drawn black. Samples are
+        aggregated with datashader when available, else np.histogram2d.
+        
+        Args:
+            ax (Axes): Axes to draw into
+            a_vals (array): Parameter value of each sample
+            x_vals (array): State value of each sample
+            a_range (tuple): Range of parameter a values
+        """
+        width, height = int(ax.bbox.width), int(ax.bbox.height)
+        
+        if DATASHADER_AVAILABLE:
+            canvas = ds.Canvas(plot_width=width, plot_height=height,
+                               x_range=tuple(a_range), y_range=(0, 1))
+            samples = pd.DataFrame({'a': a_vals, 'x': x_vals})
+            density = canvas.points(samples, 'a', 'x').values
+        else:
+            density, _, _ = np.histogram2d(x_vals, a_vals, bins=[height, width],
+                                           range=[[0, 1], list(a_range)])
+        
+        # A single hit must stay visible, so draw occupancy rather than counts
+        ax.imshow(density > 0, extent=[a_range[0], a_range[1], 0, 1],
+                  aspect='auto', origin='lower', cmap='binary', vmin=0, vmax=1,
+                  interpolation='nearest')
     
     def plot_bifurcation(self, a_range=(2.5, 4.0), n_a=2000, x0=0.5, 
-                        n_iterations=1000, n_transient=500):
+                        n_iterations=1000, n_transient=500, n_samples=256):
         """
         Create a bifurcation diagram for the logistic map.
         
@@ -198,17 +462,15 @@ class LogisticMapVisualizer:
             x0 (float): Initial condition
             n_iterations (int): Total iterations per a value
             n_transient (int): Transient iterations to discard
+            n_samples (int): Asymptotic values to keep per a
         """
         # Generate bifurcation data
         a_vals, x_vals = self.generate_bifurcation_data(
-            a_range, n_a, x0, n_iterations, n_transient)
+            a_range, n_a, x0, n_iterations, n_transient, n_samples)
         
         # Create the plot
         fig, ax = plt.subplots(figsize=self.fig_size, dpi=self.dpi)
         
-        # Plot bifurcation diagram
-        ax.plot(a_vals, x_vals, ',k', alpha=0.25, markersize=0.1)
-        
         ax.set_xlabel('Parameter a', fontsize=12)
         ax.set_ylabel('x_n', fontsize=12)
         ax.set_title('Bifurcation Diagram of Logistic Map', fontsize=14)
@@ -231,7 +493,10 @@ class LogisticMapVisualizer:
         ax.set_xlim(a_range)
         ax.set_ylim(0, 1)
         
-        plt.tight_layout()
+        # Lay out first so the density grid matches the final axes size
+        fig.tight_layout()
+        self._draw_bifurcation(ax, a_vals, x_vals, a_range)
+        
         plt.show()
     
     def comprehensive_analysis(self, a_values=[1.5, 2.8, 3.2, 3.5, 3.8]):
@@ -245,31 +510,23 @@ class LogisticMapVisualizer:
         fig = plt.figure(figsize=(15, 10), dpi=self.dpi)
         gs = GridSpec(2, 3, figure=fig)
         
+        # Reference curves shared by all cobweb panels
+        x = np.linspace(0, 1, self._screen_points(fig.get_figwidth() / gs.ncols))
+        y_logistic = self.logistic_map(x, np.array(a_values[:4])[:, None])
+        
         # Plot cobweb diagrams for different a values
         for i, a in enumerate(a_values[:4]):  # Show first 4 values
             row = i // 2
             col = i % 2
             ax = fig.add_subplot(gs[row, col])
             
-            # Generate cobweb data
-            x = np.linspace(0, 1, 1000)
-            y_logistic = self.logistic_map(x, a)
-            
-            ax.plot(x, y_logistic, 'b-', linewidth=2)
+            ax.plot(x, y_logistic[i], 'b-', linewidth=2)
             ax.plot(x, x, 'r--', linewidth=2)
             
-            # Generate cobweb
-            x0 = 0.1
-            x_n = x0
-            cobweb_x, cobweb_y = [], []
+            # Generate cobweb, starting on the identity line
+            cobweb_x, cobweb_y = self._cobweb_path(a, 0.1, 30, (0, 1))
             
-            for _ in range(30):
-                x_next = self.logistic_map(x_n, a)
-                cobweb_x.extend([x_n, x_n, x_next])
-                cobweb_y.extend([x_n, x_next, x_next])
-                x_n = x_next
-            
-            ax.plot(cobweb_x, cobweb_y, 'g-', linewidth=1, alpha=0.7)
+            self._draw_cobweb(ax, cobweb_x[1:], cobweb_y[1:])
             ax.set_title(f'a = {a}')
             ax.set_xlim(0, 1)
             ax.set_ylim(0, 1)
@@ -279,10 +536,10 @@ class LogisticMapVisualizer:
         ax_bif = fig.add_subplot(gs[:, 2])
         
         # Generate bifurcation data (smaller range for speed)
+        bif_range = (1.0, 4.0)
         a_vals, x_vals = self.generate_bifurcation_data(
-            a_range=(1.0, 4.0), n_a=1000, n_iterations=500, n_transient=250)
+            a_range=bif_range, n_a=1000, n_iterations=500, n_transient=250)
         
-        ax_bif.plot(a_vals, x_vals, ',k', alpha=0.3, markersize=0.1)
         ax_bif.set_xlabel('Parameter a')
         ax_bif.set_ylabel('x_n')
         ax_bif.set_title('Bifurcation Diagram')
@@ -292,7 +549,13 @@ class LogisticMapVisualizer:
         for a in a_values:
             ax_bif.axvline(x=a, color='red', linestyle='--', alpha=0.7)
         
-        plt.tight_layout()
+        ax_bif.set_xlim(bif_range)
+        ax_bif.set_ylim(0, 1)
+        
+        # Lay out first so the density grid matches the final axes size
+        fig.tight_layout()
+        self._draw_bifurcation(ax_bif, a_vals, x_vals, bif_range)
+        
         plt.show()
 
 def analyze_parameter_regimes():
@@ -313,28 +576,30 @@ def analyze_parameter_regimes():
         (4.0, "Full chaos")
     ]
     
-    visualizer = LogisticMapVisualizer()
+    a_values = np.array([a for a, _ in regimes])
+    
+    # Nontrivial fixed points (a - 1) / a for every regime at once
+    fixed_points = (a_values - 1) / a_values
+    
+    # Iterate all regimes together, one row per step
+    x0 = 0.5
+    iterations = np.empty((11, a_values.size))
+    iterations[0] = x0
+    for k in range(10):
+        iterations[k + 1] = a_values * iterations[k] * (1.0 - iterations[k])
     
-    for a, description in regimes:
+    for j, (a, description) in enumerate(regimes):
         print(f"\na = {a}: {description}")
         
         # Calculate fixed points
         if a <= 1:
             print(f"  Fixed point: x = 0")
         else:
-            fp1 = 0
-            fp2 = (a - 1) / a
-            print(f"  Fixed points: x = {fp1}, x = {fp2:.4f}")
+            print(f"  Fixed points: x = 0, x = {fixed_points[j]:.4f}")
         
         # Show first few iterations
-        x = 0.5
-        print(f"  First 10 iterations from x₀ = {x}:")
-        iterations = [x]
-        for i in range(10):
-            x = visualizer.logistic_map(x, a)
-            iterations.append(x)
-        
-        print(f"  {' → '.join([f'{val:.4f}' for val in iterations[:6]])}...")
+        print(f"  First 10 iterations from x₀ = {x0}:")
+        print(f"  {' → '.join([f'{val:.4f}' for val in iterations[:6, j]])}...")
 
 def main():
     """
@@ -345,24 +610,30 @@ def main():
     
     visualizer = LogisticMapVisualizer()
     
+    # Stability and cobweb plots share a single figure
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10), dpi=visualizer.dpi)
+    
     # 1. Stability Plot
     print("\n1. Creating Stability Plot...")
-    visualizer.plot_stability(a=2.5)
+    visualizer.plot_stability(a=2.5, ax=axes[0, 0])
     
     # 2. Cobweb Diagrams for different behaviors
     print("\n2. Creating Cobweb Diagrams...")
     
     # Stable fixed point
     print("   - Stable fixed point (a = 2.8)")
-    visualizer.plot_cobweb(a=2.8, x0=0.1, n_iter=20)
+    visualizer.plot_cobweb(a=2.8, x0=0.1, n_iter=20, ax=axes[0, 1])
     
     # Period-2 cycle
     print("   - Period-2 cycle (a = 3.1)")
-    visualizer.plot_cobweb(a=3.1, x0=0.1, n_iter=30)
+    visualizer.plot_cobweb(a=3.1, x0=0.1, n_iter=30, ax=axes[1, 0])
     
     # Chaotic behavior
     print("   - Chaotic behavior (a = 3.7)")
-    visualizer.plot_cobweb(a=3.7, x0=0.1, n_iter=50)
+    visualizer.plot_cobweb(a=3.7, x0=0.1, n_iter=50, ax=axes[1, 1])
+    
+    plt.tight_layout()
+    plt.show()
     
     # 3. Bifurcation Diagram
     print("\n3. Creating Bifurcation Diagram...")